@@ -0,0 +1,25 @@
+"""
+gunicorn configuration, picked up automatically by `gunicorn main:app` from the working directory
+"""
+from multiprocessing import cpu_count
+
+"""
+spin up the service on host = "0.0.0.0", port 5050
+
+bind to all network interfaces (0.0.0.0) instead of just localhost,
+allowing it to accept connection from outside the Docker container, if spun up with docker
+"""
+bind: str = "0.0.0.0:5050"
+
+"""
+the contract selection is compute bound, so we scale with pre-forked worker processes, not just threads
+"""
+workers: int = (2 * cpu_count()) + 1
+worker_class: str = "gthread"
+threads: int = 2
+
+"""
+import the app (and with it numpy, numba and the compiled kernels) once in the master process, before forking
+the workers then share these module globals copy-on-write, instead of each paying the import and warm up cost
+"""
+preload_app: bool = True
@@ -1,6 +1,7 @@
 from typing import Any
 
-from flask import Flask, Response, request, jsonify
+import orjson
+from flask import Flask, Response, abort, request
 
 from models.contract import Contract
 from models.slim_solution import SlimSolution
@@ -10,23 +11,23 @@ app: Flask = Flask(__name__)
 
 @app.route("/spaceship/optimize", methods=["POST"])
 def spaceship_optimize() -> Response:
-    raw_input_data: list[dict[str, Any]] = request.get_json()
-    contracts: list[Contract] = [
-        contract
-        for contract in map(
-            lambda contract_dict: Contract.parse_obj(contract_dict), raw_input_data
-        )
-    ]
+    # orjson parses (and below, serializes) considerably faster than flask's stdlib json provider
+    # the raw body is only read once, so there is no need for flask to cache it
+    try:
+        raw_input_data: list[dict[str, Any]] = orjson.loads(request.get_data(cache=False))
+    except orjson.JSONDecodeError:
+        # a malformed body is the client's fault; same 400 as flask's request.get_json()
+        abort(400, description="request body is not valid JSON")
+    if not isinstance(raw_input_data, list):
+        abort(400, description="request body must be a list of contracts")
+    try:
+        contracts: list[Contract] = [Contract.from_dict(contract_dict) for contract_dict in raw_input_data]
+    except (KeyError, TypeError, ValueError):
+        abort(400, description="request body must be a list of contracts with a name, start, duration and price")
     solution: SlimSolution = resolve_optimize_contracts(contracts=contracts)
-    serialized_solution: Response = jsonify(solution.dict())
+    serialized_solution: Response = Response(
+        orjson.dumps({"income": solution.income, "path": solution.path}),
+        mimetype="application/json",
+    )
     return serialized_solution
 
-
-if __name__ == "__main__":
-    """
-    spin up the service on host = "0.0.0.0", port 5000
-
-    bind to all network interfaces (0.0.0.0) instead of just localhost,
-    allowing it to accept connection from outside the Docker container, if spun up with docker
-    """
-    app.run(host="0.0.0.0", port=5050)
\ No newline at end of file
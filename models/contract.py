@@ -1,15 +1,77 @@
-from pydantic import BaseModel
+from typing import Any, NamedTuple, Sequence
 
+import numpy as np
 
-class Contract(BaseModel):
+
+class Contract(NamedTuple):
+    """
+    plain NamedTuple instead of a pydantic BaseModel;
+    attribute access on a pydantic model is noticeably slower in the inner loops of the pruning and selector services
+    there is no validation on construction; from_dict coerces the fields of a decoded JSON contract object
+
+    a tuple is immutable, so it is hashable
+    hashable behaviour used in approximate beam search contract selector service
+    the hash is CPython's C level tuple hash, instead of a generated python __hash__
+    """
     name: str
     start: int
     duration: int
     price: int
 
-    class Config:
+    @classmethod
+    def from_dict(cls, contract_dict: dict[str, Any]) -> "Contract":
         """
-        set this contract to be frozen, so it can be hashable
-        hashable behaviour used in approximate beam search contract selector service
+        replacement for pydantic's parse_obj, for a decoded JSON contract object
+        positional construction; no keyword argument processing, and no validators
+
+        coerces the fields like pydantic did, e.g. a numeric name becomes a str, and "3" becomes 3
+        raises KeyError for a missing field, ValueError or TypeError for a field which cannot be coerced,
+        and ValueError for a null or non scalar name, an int outside of int64, or a negative duration
         """
-        frozen = True
\ No newline at end of file
+        name: Any = contract_dict["name"]
+        if not isinstance(name, (str, int, float)):
+            raise ValueError(f"contract name must be a string, got {name!r}")
+        duration: int = _to_int64(contract_dict["duration"], "duration")
+        if duration < 0:
+            raise ValueError(f"contract duration must not be negative, got {duration}")
+        return cls(
+            str(name),
+            _to_int64(contract_dict["start"], "start"),
+            duration,
+            _to_int64(contract_dict["price"], "price"),
+        )
+
+
+INT64_MIN: int = int(np.iinfo(np.int64).min)
+INT64_MAX: int = int(np.iinfo(np.int64).max)
+
+
+def _to_int64(value: Any, field_name: str) -> int:
+    """
+    coerce a decoded JSON value to an int, which must fit in int64, as the pruning and selector services
+    work on int64 arrays
+    """
+    try:
+        integer: int = int(value)
+    except OverflowError as error:
+        # e.g. int(float("inf"))
+        raise ValueError(f"contract {field_name} must be a finite number, got {value!r}") from error
+    if not INT64_MIN <= integer <= INT64_MAX:
+        raise ValueError(f"contract {field_name} must fit in a signed 64 bit integer, got {value!r}")
+    return integer
+
+def to_arrays(contracts: Sequence[Contract]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    materialize the contracts into int64 (starts, durations, prices) arrays, a struct of arrays
+    used by the pruning and selector services, so each attribute is only read from the contracts once
+
+    raises ValueError if a start, duration or price does not fit in int64
+    """
+    number_of_contracts: int = len(contracts)
+    try:
+        starts: np.ndarray = np.fromiter((contract.start for contract in contracts), dtype=np.int64, count=number_of_contracts)
+        durations: np.ndarray = np.fromiter((contract.duration for contract in contracts), dtype=np.int64, count=number_of_contracts)
+        prices: np.ndarray = np.fromiter((contract.price for contract in contracts), dtype=np.int64, count=number_of_contracts)
+    except OverflowError as error:
+        raise ValueError("contract start, duration and price must fit in a signed 64 bit integer") from error
+    return starts, durations, prices
@@ -42,8 +42,10 @@ class SlimSolution(BaseModel):
         """
         helper smart constructor;
         specifically, to return an empty Solution object
+
+        construct skips pydantic validation, there is nothing to validate here
         """
-        return SlimSolution(income=0, path=[])
+        return SlimSolution.construct(income=0, path=[])
 
     @property
     def is_empty(self) -> bool:
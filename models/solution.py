@@ -2,7 +2,6 @@ import random
 from typing import Optional
 
 from pydantic import BaseModel
-from sortedcontainers import SortedDict
 
 from models.contract import Contract
 from models.slim_solution import SlimSolution, ContractName
@@ -12,13 +11,32 @@ class Solution(BaseModel):
     """
     used in approximateGreedyContractSelectorService
         keep track of contracts of a solution thus far
-        while, storing the contracts in a self-balancing BST
+        while, storing the contracts in a plain list, ordered by start time
 
-    we have to use a BST here, as we are doing frequent query for contract overlap, and insertions
+    Q: why not a self-balancing BST (SortedDict)?
+    A: the path is short, and copied on every add_contract; a list is far cheaper to build and copy,
+    and we can still binary search it by start time for the overlap query
     """
 
     income: int
-    path: SortedDict[int, Contract] # start time, to Contract
+    path: list[Contract] # ordered by ascending start time
+
+    def bisect_start(self, start: int) -> int:
+        """
+        time complexity: O(Log N)
+
+        index of the first contract in path which starts at or after the given start time
+        this is also the index at which a contract with the given start time should be inserted
+        """
+        low: int = 0
+        high: int = len(self.path)
+        while low < high:
+            middle: int = (low + high) // 2
+            if self.path[middle].start < start:
+                low = middle + 1
+            else:
+                high = middle
+        return low
 
     def has_overlap(self, contract: Contract) -> bool:
         """
@@ -28,27 +46,23 @@ class Solution(BaseModel):
 
         check if a given contract's start time and duration, overlaps with any Contract in path
 
-        SortedDict is implemented with a self-balancing Binary Search Tree
-
-        Q: why are we using a BST here?
-        A. we are doing insertion and search frequently
-        A BST is perfect for O(Log N) time complexity for both operations
+        path is ordered by start time, so we binary search it for the neighbouring contracts
         """
 
         # index of first is a variable used to determine the index at which the current contract should be inserted
-        index_to_insert: int = self.path.bisect_left(contract.start)
+        index_to_insert: int = self.bisect_start(contract.start)
 
         # if index_to_insert > 0, we have a contract which has a start time smaller than the current contract
         # check if the current contract overlaps with the previous contract's end
         if index_to_insert > 0:
-            previous_contract: Contract = self.path.peekitem(index_to_insert - 1)[1]
+            previous_contract: Contract = self.path[index_to_insert - 1]
             if previous_contract.start + previous_contract.duration > contract.start:
                 return True
 
         # if index_to_insert < len(self.path), there is a contract which starts after the current contract
         # check if the current contract overlaps with the next contract's start
         if index_to_insert < len(self.path):
-            next_contract: Contract = self.path.peekitem(index_to_insert)[1]
+            next_contract: Contract = self.path[index_to_insert]
             if contract.start + contract.duration > next_contract.start:
                 return True
 
@@ -57,7 +71,7 @@ class Solution(BaseModel):
 
     def add_contract(self, contract: Contract) -> "Solution":
         """
-        time complexity: O(Log N) to insert
+        time complexity: O(N) to copy the path, and insert in start time order
 
         used to add a contract to a solution
 
@@ -80,14 +94,13 @@ class Solution(BaseModel):
 
         this is used to add the new contract to the solution, and update the max profit
         """
-        assert (
-            contract.start not in self.path
-        ), f"contract.start already in self.path, this should not happen as an input contract should not overlap with existing contracts. existing solution path: {self.path}, incoming contract: {contract}"
-        # must be a deep copy here; we do not want duplicate Solution objects pointing to the same 'path'
-        new_solution: "Solution" = self.copy(deep=True)
-        new_solution.income += contract.price
-        new_solution.path[contract.start] = contract
-        return new_solution
+        # must be a new list here; we do not want duplicate Solution objects pointing to the same 'path'
+        # contracts are immutable, so a shallow copy is enough, no need for pydantic's generic copy(deep=True)
+        new_path: list[Contract] = self.path.copy()
+        # contracts are usually added in chronological order, so this is usually an append
+        new_path.insert(self.bisect_start(contract.start), contract)
+        # construct skips validation; both fields are already trusted
+        return Solution.construct(income=self.income + contract.price, path=new_path)
 
     def choose_random_contract(self) -> Optional[Contract]:
         """
@@ -97,17 +110,20 @@ class Solution(BaseModel):
         if number_of_contracts == 0:
             return None
         random_index: int = random.randrange(0, number_of_contracts)
-        _, random_contract = self.path.peekitem(random_index)
-        return random_contract
+        return self.path[random_index]
 
     def remove_contract(self, contract: Contract) -> "Solution":
         """
         used in Local Search, where we randomly remove a contract in a bid to find a better solution
         the contract passed in might not exist
+
+        time complexity: O(Log N) to find the contract, a single list pop to remove it
         """
-        if contract.start in self.path:
-            self.income + contract.price
-            self.path.pop(contract.start)
+        index: int = self.bisect_start(contract.start)
+        if index < len(self.path) and self.path[index].start == contract.start:
+            removed_contract: Contract = self.path.pop(index)
+            # the income must drop by the price of the contract we actually removed
+            self.income -= removed_contract.price
         return self
 
     @staticmethod
@@ -115,8 +131,11 @@ class Solution(BaseModel):
         """
         helper smart constructor;
         specially, to return an empty Solution
+
+        construct skips pydantic validation, there is nothing to validate here
+        a fresh instance (rather than a shared sentinel) is returned, as remove_contract mutates the solution in place
         """
-        return Solution(income=0, path=SortedDict())
+        return Solution.construct(income=0, path=[])
 
     @property
     def is_empty(self) -> bool:
@@ -126,7 +145,10 @@ class Solution(BaseModel):
         return self.income == 0 and len(self.path) == 0
 
     def to_slim(self) -> SlimSolution:
-        return SlimSolution(
+        """
+        construct skips pydantic validation; the income and contract names are already trusted
+        """
+        return SlimSolution.construct(
             income=self.income,
-            path=[ContractName(contract.name) for contract in self.path.values()]
+            path=[ContractName(contract.name) for contract in self.path]
         )
\ No newline at end of file
@@ -1,6 +1,39 @@
-from sortedcontainers import SortedDict
-
-from models.contract import Contract
+import numpy as np
+from numba import njit
+
+from models.contract import Contract, to_arrays
+
+
+# explicit signature; compiled eagerly at import time (or loaded from the on-disk cache), not on the first request
+@njit("boolean[:](int64[:], int64[:], int64[:])", cache=True)
+def compute_keep_mask(sorted_starts: np.ndarray, sorted_durations: np.ndarray, sorted_prices: np.ndarray) -> np.ndarray:
+    """
+    numba compiled pruning sweep, over int64 arrays only
+
+    the contracts must be sorted by ascending start, tie break by ascending duration, descending price
+    so every contract seen before the current one at the same start time is shorter, or equally long and pays at least as much
+
+    returns a boolean mask; True where the contract is strictly more profitable than the best contract seen so far
+    at its start time, False where it is dominated and should be pruned
+
+    a contract with a zero duration does not occupy the spaceship; it can be taken together with any contract
+    starting or ending at its start time, and with other zero duration contracts at that time
+    so it never competes with the other contracts at its start time; it is always kept, and never prunes anything
+    """
+    keep_mask: np.ndarray = np.zeros(len(sorted_starts), dtype=np.bool_)
+    has_best_price: bool = False
+    best_price_start: int = 0
+    best_price_at_start: int = 0
+    for index in range(len(sorted_starts)):
+        if sorted_durations[index] == 0:
+            keep_mask[index] = True
+            continue
+        if not has_best_price or sorted_starts[index] != best_price_start or sorted_prices[index] > best_price_at_start:
+            keep_mask[index] = True
+            has_best_price = True
+            best_price_start = sorted_starts[index]
+            best_price_at_start = sorted_prices[index]
+    return keep_mask
 
 
 class ContractPruningService:
@@ -28,9 +61,16 @@ class ContractPruningService:
         Contract 1, start time 0 hrs, duration 3 hrs, profit = 5
         Contract 2, start time 0 hrs, duration 4 hrs, profit = 6
         (Prune) Contract 3, start time 0 hrs, duration 5 hrs, profit = 6
+
+        both cases are the one dominance check below; prune_contracts applies it in a single sweep,
+        comparing each contract only against the best price seen so far at its start time
+
+        a contract with a zero duration does not occupy the spaceship, so it neither prunes, nor is pruned
         """
         if prune_candidate.start != next_best_contract.start:
             return False
+        if prune_candidate.duration == 0 or next_best_contract.duration == 0:
+            return False
         return (
             prune_candidate.price <= next_best_contract.price
             and prune_candidate.duration >= next_best_contract.duration
@@ -45,29 +85,35 @@ class ContractPruningService:
         where T is the number of unique start hours
         and N is the number of contracts
 
-        worst case time complexity: O(LogN)
+        worst case time complexity: O(NLogN)
         - NLogN: sort the contracts according to the start, duration
-        - NLogN: iterate each contract, grouping each contract by start time into a SortedDict (Balanced BST implementation)
-            the key is the start time
-            for a given contract, check if there is a contract with the same start time
-            - with the same duration, but higher profits
-            - with a shorter duration and higher profits
+        - N: a single sweep over the sorted contracts, keeping the best price seen so far for each start time
+            for a given contract, every contract at the same start time seen before it has
+            - a shorter duration, or
+            - the same duration, and an equal or higher profit
 
-            if so, prune it by skipping it. else, add it as an unpruned contract
-            - using SortedDict as a Balanced BST imeplemented list, keep the search and insertion to LogN time
-        - worst case happens when all contracts have the same start time
-        - all contracts end up being stored in the same BST, giving a high base for LogN search and insertion
+            so the current contract is pruned iff its price is not strictly higher than the best price seen so far
+            at its start time; one comparison per contract, in a numba compiled loop, no BST needed
 
         worst case space complexity: O(N), in the worst case, we don't prune any contracts
-        - this happens when all the contracts have unique start time
-        - worst case for memory specifically happens when all provided contracts have unique start time and duration
-        - we end up storing all contracts' start and duration (as the key) into the dictionary
+        - this happens when every contract is strictly more profitable than the shorter contracts at its start time
+        """
+        if len(contracts) == 0:
+            return []
 
+        starts, durations, prices = to_arrays(contracts)
+        return [
+            contracts[index]
+            for index in ContractPruningService.prune_contract_indices(starts, durations, prices).tolist()
+        ]
 
-        start time to a priority queue of contracts which start at that time
-        the priority queue orders the contract by duration
+    @staticmethod
+    def prune_contract_indices(starts: np.ndarray, durations: np.ndarray, prices: np.ndarray) -> np.ndarray:
+        """
+        the struct of arrays version of prune_contracts, for callers which already hold the contracts' int64 arrays
+
+        returns the indices of the contracts to keep as an int64 array, ordered by (start time, duration)
         """
-        pruned_contracts_dict: SortedDict[int, SortedDict[int, Contract]] = SortedDict()
 
         """
         O(NLogN)
@@ -76,97 +122,21 @@ class ContractPruningService:
         by processing contracts in ascending duration for each start time, and the more promising contracts first
         we won't encounter a contract with shorter duration after processing contracts with longer durations
         in short, we don't have to worry about removing existing sub-par contracts from the final result
+
+        sorted with np.lexsort, instead of calling a python lambda per comparison key
+        np.lexsort sorts by the last key first; so this is start, then duration, then descending price
         """
-        contracts.sort(key=lambda x: (x.start, x.duration, -x.price))
-
-        # O(NLogN)
-        for contract in contracts:
-            """
-            the SortedList is implemented with a self balancing binary search tree
-            
-            Q: why do we use a binary search tree here?
-            A: we will be inserting a contract into it, and searching for the next shortest contract often
-            it has a O(LogN) time complexity for both operations
-            """
-            existing_contracts_at_start: SortedDict[int, Contract] = pruned_contracts_dict.get(contract.start, SortedDict())
-
-            """
-            find a contract with the same duration
-            
-            if we already have a contract which have the same duration,
-            check if the current contract has a better profit
-            if yes, prune the old contract
-            
-            O(LogN)
-            """
-            if (contract.duration in existing_contracts_at_start and
-                    contract.price > existing_contracts_at_start[contract.duration].price):
-                # O(LogN) to replace the existing contract with a new one
-                existing_contracts_at_start[contract.duration] = contract
-                # update the top-level pruned_contracts_dict
-                pruned_contracts_dict[contract.start] = existing_contracts_at_start
-            elif (contract.duration not in existing_contracts_at_start
-                    and len(existing_contracts_at_start) > 0):
-                """
-                find a contract with the longest duration, just slightly less than the current contract's duration
-                {
-                    1: Contract(start=0, duration=2, price=10)
-                }
-                given a new contract: Contract(start=0, duration=3, price=20)
-                index_to_insert_contract = 1
-
-                given a new contract: Contract(start=0, duration=1, price=20)
-                index_to_insert_contract = 0
-
-                O(LogN)
-                """
-                index_to_insert_contract: int = existing_contracts_at_start.bisect_left(contract.duration)
-                if index_to_insert_contract > 0:
-                    # there is a contract with a duration shorter than it
-                    index_to_contract_with_shorter_duration = index_to_insert_contract - 1
-                    next_best_contract_candidate: Contract = existing_contracts_at_start.peekitem(index_to_contract_with_shorter_duration)[1]
-                    if next_best_contract_candidate.duration < contract.duration:
-                        """
-                        prune the current contract (e.g. skip it)
-                        if the existing contract's price with shorter duration is equal or more than the current contract
-                        """
-                        if contract.price > next_best_contract_candidate.price:
-                            existing_contracts_at_start[contract.duration] = contract
-                            # update the top-level pruned_contracts_dict
-                            pruned_contracts_dict[contract.start] = existing_contracts_at_start
-                else:
-                    # there is no contract with shorter duration, insert the contract
-                    existing_contracts_at_start[contract.duration] = contract
-                    # update the top-level pruned_contracts_dict
-                    pruned_contracts_dict[contract.start] = existing_contracts_at_start
-            elif len(existing_contracts_at_start) == 0:
-                """
-                there is no existing contract at this start time
-                add the contract in
-                """
-                existing_contracts_at_start[contract.duration] = contract
-                # update the top-level pruned_contracts_dict
-                pruned_contracts_dict[contract.start] = existing_contracts_at_start
+        sorted_indices: np.ndarray = np.lexsort((-prices, durations, starts))
 
         """
-        iterate through the remaining pruned contracts in pruned_contracts_dict, and flatten them into a list
-        the flattened list should be ordered such that the contracts are ordered by (start time, duration)
-        this is easily done, as we are using SortedDict (a BST)
-        
-        worst case:
-        - all contracts are all of the same start time.
-        
-        given N is the number of contracts, and all N contracts have the same start time
-        - all contracts are in the same SortedDict (binary tree)
-        
-        time Complexity: O(NLogN)
+        O(N)
+        a single compiled sweep over the sorted arrays marks which contracts to keep;
+        only the surviving indices are gathered, and they come out already ordered by (start time, duration)
         """
-        final_result: list[Contract] = []
-        for _, duration_to_contract_bst in pruned_contracts_dict.items():
-            for _, contract in duration_to_contract_bst.items():
-                final_result.append(contract)
-
-        return final_result
+        keep_mask: np.ndarray = compute_keep_mask(
+            starts[sorted_indices], durations[sorted_indices], prices[sorted_indices]
+        )
+        return sorted_indices[keep_mask]
 
 if __name__ == "__main__":
     contract_pruning_service = ContractPruningService()
@@ -1,199 +1,241 @@
-import bisect
-
-from models.contract import Contract
-from models.solution import Solution
+"""
+responsible for selecting from a list of contracts
+
+we are choosing from a list of spaceship contracts to take with the following constraints:
+    - each contract can only be taken at the contract start hour
+    - we only have 1 spaceship; we cannot take multiple contracts at the same time
+
+and our objective is to maximize profit
+
+implementation 1 (definite): select the best contracts from a set of contracts,
+to maximize profit at the end of time
+
+drawback:
+    - our graph of scenarios (considering we do not employ pruning, or memoization yet)
+      will be a tree with 2^N nodes, where N is the number of contracts
+    - even with pruning and memoization, it will still be pretty expensive to calculate:
+      it has a worst case time complexity of O(TN),
+      where T is the number of unique start time, N is the number of contractor
+
+      Q: if it is so inefficient, why are we still implementing this?
+      A: we will be using this to get the global minima / definite solution,
+         this let us cross validate which is the best one.
+
+implementation: bottom-up dynamic programming with memoization
+    - to be specific, we will be calculating the max profit solution for specifically the earlier
+      end time belonging to each contract before we continue to calculate that for the later time frames
+
+     e.g. we will calculate the best profit from t=0 to t=10,
+     before we continue to calculate that for the later time frames
+
+    specifically, we will be using two 1D int64 arrays, indexed by the position of a unique start hour
+    - income_dp[i] is the max profit up till start_hours[i]
+    - parent_idx[i] is the index of the contract which produced income_dp[i], or -1 if none did
+
+    Q: why not index the arrays by the hour itself?
+    A: the time range can be quite large
+    if we index by hour, this 1D array risks being sparsely populated,
+    and use up unnecessary memory
+    - specifically, an hour which does not correspond with any start time
+      of a contract, will be empty
+
+    so we only keep a slot for each unique start hour (and the latest end hour)
+
+    Q: why not keep a Solution per hour?
+    A: copying a Solution (a pydantic model holding the path of contracts) for every update
+    is the real bottleneck; instead, the DP works on plain integers, in a numba compiled kernel,
+    and the winning path is reconstructed once at the end, by walking the back-pointers
+"""
+from functools import lru_cache
+from typing import Sequence
+
+import numpy as np
+from numba import njit
+
+from models.contract import Contract, to_arrays
+from models.slim_solution import SlimSolution, ContractName
 from services.contract_pruning_service import ContractPruningService
-from services.contractor_selector_service import ContractSelectorService
 
 
-class DefiniteContractSelectorService(ContractSelectorService):
+# the explicit signature makes numba compile the kernel eagerly, at import time, instead of on the first request
+# with cache=True, the compiled machine code is written next to this module (in __pycache__),
+# so later processes load it from disk, rather than compiling it again
+@njit("Tuple((int64[:], int64[:], int64[:]))(int64[:], int64[:], int64[:], int64[:])", cache=True)
+def compute_income_dp(
+        starts: np.ndarray, ends: np.ndarray, prices: np.ndarray, start_hours: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
     """
-    implementation 1: responsible for selecting the best contracts from a set of contracts,
-    to maximize profit at the end of time
-
-    drawback:
-        - our graph of scenarios (considering we do not employ pruning, or memoization yet)
-          will be a tree with 2^N nodes, where N is the number of contracts
-        - even with pruning and memoization, it will still be pretty expensive to calculate:
-          it has a worst case time complexity of O(TN),
-          where T is the number of unique start time, N is the number of contractor
-
-          Q: if it is so inefficient, why are we still implementing this?
-          A: we will be using this to get the global minima / definite solution,
-             this let us cross validate which is the best one.
-
-    implementation: bottom-up dynamic programming with memoization
-        - to be specific, we will be calculating the max profit solution for specifically the earlier
-          end time belonging to each contract before we continue to calculate that for the later time frames
-
-         e.g. we will calculate the best profit from t=0 to t=10,
-         before we continue to calculate that for the later time frames
-
-        specifically, we will be using a 1D dict[int, Solution] dp dictionary,
-        where dp[0] represents the smaller solution of max profit at time 0
-
-        Q: why not use a list[int]?
-        A: the time range can be quite large
-        if we use a list[int], this 1D array risks being sparsely populated,
-        and use up unnecessary memory
-        - specifically, start_time - 1 is the index, and if it does not correspond with any start time
-          of a contract, it will be empty
-
-        so we use a dictionary to only use the memory we need
+    numba compiled bottom-up dynamic programming kernel, over int64 arrays only
+
+    the contracts (starts, ends, prices) must be sorted by ascending start time,
+    and start_hours must be the sorted unique start hours, followed by the latest contract end hour
+    durations (ends - starts) must not be negative
+
+    returns (income_dp, parent_idx, predecessor_idx)
+    - income_dp[i] is the max profit up till start_hours[i]
+    - parent_idx[i] is the index of the contract which produced income_dp[i], or -1 if none did
+    - predecessor_idx[c] is the index of the contract taken right before contract c, or -1 if none was
+
+    Q: why keep predecessor_idx per contract, instead of looking up parent_idx at the contract's start hour?
+    A: a contract with a zero duration writes to its own start hour; parent_idx at that start hour then points
+    back at the contract itself, and the contract it was built on is overwritten
+    predecessor_idx is recorded before any write, and always holds an earlier contract index,
+    so walking it always moves strictly backwards, and terminates
     """
+    # same dtype as prices; int64 when compiled, python ints (object) when run through compute_income_dp.py_func
+    income_dp: np.ndarray = np.zeros(len(start_hours), dtype=prices.dtype)
+    parent_idx: np.ndarray = np.full(len(start_hours), -1, dtype=np.int64)
+    predecessor_idx: np.ndarray = np.full(len(starts), -1, dtype=np.int64)
 
-    def select_contracts(self, contracts: list[Contract]) -> Solution:
+    for contract_index in range(len(starts)):
+        """
+        every contract which ends at or before this contract's start has an earlier start,
+        so it was already processed; the max profit at this contract's start hour is final
         """
-        N is the number of contacts
-        worst case time complexity: O(N + NlogN + TN) = O(TN)
+        start_hour_index: int = np.searchsorted(start_hours, starts[contract_index])
+        candidate_income: int = income_dp[start_hour_index] + prices[contract_index]
+        predecessor_idx[contract_index] = parent_idx[start_hour_index]
 
-        technically, the worst case time complexity for key-value access is O(N),
-        specifically for a dictionary with a high load factor
-        but, lets keep it simple for the worst case time complexity, and say it is O(1)
+        """
+        time Complexity: O(LogT), where T is the number of unique start times
+        use binary search to find the index of the earliest start hour at or after the end hour, in start_hours
+        """
+        earliest_start_hour_index: int = np.searchsorted(start_hours, ends[contract_index])
 
-        step 1: sort the contract in ascending order, smaller start time first
-            - invitation: we need the smaller sub problem of max profit at an earlier time
-            - to calculate the solution of max profit at a later time
+        """
+        income_dp is monotone non-decreasing; the max profit up till a later start hour is never lower
+        so if the new solution cannot beat the max profit at the earliest start hour after this contract's end hour,
+        it cannot beat it at any later start hour either; skip the propagation entirely
+        """
+        if candidate_income <= income_dp[earliest_start_hour_index]:
+            continue
 
-        step 2: iterate through all the sorted contracts to calculate the solution of max profit
-                at a given end time of a contract
-            - use a DP dictionary table, with the bottom solution; the best profit from t=0 to t=contract.duration
-            - adjacency list, with the best contract from t=0 to t=contract.duration
+        """
+        time Complexity: O(LogT + U), where U is the number of start hours whose max profits are improved
 
-        Q: lets say we have the following contracts
-            [ (0,1), (2,3), (4,5), (0,12) ]
-        do we really need to calculate the best solution from t=0 to t=12?
-        A: no, when calculating the solution of max profits at a given end time of a contract...
-           we need the smaller sub problem of max profits at the given start time of the contract
+        for all start hours that occur at or after the contract end hour, update their max profits with the new solution
+        as income_dp is monotone, the start hours to improve are a contiguous run, ending before the first start hour
+        whose max profit is already equal or higher; binary search for it, and write the run as one slice
+        """
+        first_unimproved_start_hour_index: int = earliest_start_hour_index + np.searchsorted(
+            income_dp[earliest_start_hour_index:], candidate_income
+        )
+        income_dp[earliest_start_hour_index:first_unimproved_start_hour_index] = candidate_income
+        parent_idx[earliest_start_hour_index:first_unimproved_start_hour_index] = contract_index
 
-           specifically, we have a contract from (2,3) we update the max profit at end time 3 as follows
+    return income_dp, parent_idx, predecessor_idx
 
-        dp_dict[3] = max(dp_dict[3], dp_dict[2] + contract_price)
 
-        this means, we can keep track of the unique start timings that appeared using a list
-        { 0, 2, 4 }
+# requests with more contracts than this are not memoized, see select_contracts
+MAX_CACHED_CONTRACTS: int = 1_000
 
-        and only iterate these to update all solutions for start timings greater than
-        - dp_dict[4] = max(dp_dict[4], dp_dict[3])
 
-        memoizes the solutions to the smaller sub problems
-        the maximum profit up till time t, where t is of type 'int', and is the key of the dictionary
-        """
-        if len(contracts) == 0:
-            return Solution.empty()
+def select_contracts(contracts: list[Contract]) -> SlimSolution:
+    """
+    given a list of contracts, return the SlimSolution with the max profit
 
-        dp: dict[int, Solution] = {}
+    for small requests, the search itself is memoized on the (hashable) tuple of contracts, so a replayed request,
+    e.g. a retry or a benchmark, skips the pruning and the DP entirely
 
-        """
-        N is the number of contracts
-        prune contracts, and then sort them by ascending start and duration
-        time complexity: O(LogN)
-        """
-        pruned_contracts: list[Contract] = ContractPruningService.prune_contracts(contracts)
-        end_of_duration: int = max(
-            map(lambda x: x.start + x.duration, pruned_contracts)
-        )
+    Q: why only small requests?
+    A: the cache key keeps the whole contract list alive, in every worker process
+    so only requests of up to MAX_CACHED_CONTRACTS contracts are cached, and only the latest few of them;
+    larger requests are always solved from scratch, where the DP dominates the cost of a replay anyway
+
+    a fresh SlimSolution is built per call, as SlimSolution is mutable and must not be shared between callers
+    it is built with construct, which skips pydantic validation; the income and path are trusted
+    """
+    if len(contracts) <= MAX_CACHED_CONTRACTS:
+        income, path = _cached_select_contract_path(tuple(contracts))
+    else:
+        income, path = _select_contract_path(contracts)
+    return SlimSolution.construct(income=income, path=list(path))
 
-        """        
-        time Complexity: O(N)
 
-        get the unique start hours in the contracts; 
+def _select_contract_path(contracts: Sequence[Contract]) -> tuple[int, tuple[ContractName, ...]]:
+    """
+    N is the number of contacts
+    worst case time complexity: O(N + NlogN + TN) = O(TN)
 
-        this is sorted ascending, and used for binary searching the earliest contract start time / latest contract end time, after a given contract end time
+    step 1: prune the contracts, which also sorts them in ascending order, smaller start time first
+        - invitation: we need the smaller sub problem of max profit at an earlier time
+        - to calculate the solution of max profit at a later time
 
-        intuition:
+    step 2: iterate through all the sorted contracts to calculate the max profit
+            at each unique start hour at or after the end of a contract
+        - this is done in compute_income_dp, on int64 arrays of the contracts' start, end and price
 
-        lets say we have the following contracts
-        [(1, 2), (3, 4), (4, 5)]
+    Q: lets say we have the following contracts
+        [ (0,1), (2,3), (4,5), (0,12) ]
+    do we really need to calculate the best solution from t=0 to t=12?
+    A: no, when calculating the solution of max profits at a given end time of a contract...
+       we need the smaller sub problem of max profits at the given start time of the contract
 
-        after we calculate the max profits at contract end time 2, 
-        we will be using this to update the max profits at contract start time 3 and 4, and end time 5
+    this means, we can keep track of the unique start timings that appeared
+    { 0, 2, 4 }
 
-        these updated max profits at contract start time 3 and 4 will be used to calculate the max profits at contract end time 4 and 5.
-        """
-        start_hours: list[int] = list(
-            sorted(set([contract.start for contract in pruned_contracts]))
+    and only iterate these to update all solutions for start timings greater or equal to the end time
+
+    step 3: walk the back-pointers (parent_idx, then predecessor_idx) from the latest end hour, to reconstruct the winning path once
+        - returned as the (income, path) pair, there is no intermediate Solution to convert with to_slim()
+    """
+    if len(contracts) == 0:
+        return 0, ()
+
+    """
+    N is the number of contracts
+    prune contracts, and then sort them by ascending start and duration
+    time complexity: O(NLogN)
+
+    the contracts' attributes are read into int64 arrays exactly once; the pruning, the end hours,
+    and the DP all work on these arrays, and only the winning path goes back to the Contract objects
+    """
+    all_starts, all_durations, all_prices = to_arrays(contracts)
+    if (all_durations < 0).any():
+        raise ValueError("contract duration must not be negative")
+    pruned_indices: np.ndarray = ContractPruningService.prune_contract_indices(all_starts, all_durations, all_prices)
+    starts: np.ndarray = all_starts[pruned_indices]
+    ends: np.ndarray = starts + all_durations[pruned_indices]
+    prices: np.ndarray = all_prices[pruned_indices]
+    end_of_duration: int = int(ends.max())
+
+    """
+    get the unique start hours in the contracts; np.unique returns them sorted ascending
+
+    add the latest contract end time too, so we update the max profits solution at the end of time
+    every time we calculate the max profits at a given contract end time.
+    """
+    start_hours: np.ndarray = np.append(np.unique(starts), end_of_duration)
+
+    """
+    time complexity: O(T * N)
+
+    the compiled kernel sums incomes in int64, which would silently wrap around past np.iinfo(np.int64).max
+    the max profit never exceeds the sum of the positive prices; if that sum might not fit,
+    run the same kernel uncompiled (py_func), over python ints, which cannot overflow
+    """
+    if sum(price for price in prices.tolist() if price > 0) <= np.iinfo(np.int64).max:
+        income_dp, parent_idx, predecessor_idx = compute_income_dp(starts, ends, prices, start_hours)
+    else:
+        income_dp, parent_idx, predecessor_idx = compute_income_dp.py_func(
+            starts, ends, prices.astype(object), start_hours
         )
 
-        """
-        add the latest contract end time too, so we update the max profits solution at the end of time 
-        every time we calculate the max profits at a given contract end time. 
-        """
-        start_hours.append(end_of_duration)
+    """
+    time complexity: O(P), where P is the number of contracts in the winning path
 
-        """
-        time complexity: O(T * N)
-        iterate through all contracts to populate the DP table
-        """
-        for contract in pruned_contracts:
-            curr_contract_end_hour: int = contract.start + contract.duration
-            solution_at_end_hour: Solution = dp.get(
-                curr_contract_end_hour, Solution.empty()
-            )
-            """
-            we use the smaller solution of max profits at the start hour of each contract
-            to calculate the max profits at the end hour of each contract
-            after we calculate a new solution at e.g t = 10...
-            we should use it to update all solutions at the unique start hour of each contracts, which comes after t = 10
-            """
-            solution_at_start_hour: Solution = dp.get(contract.start, Solution.empty())
-
-            # candidate best profits at end hour
-            candidate_best_profits_at_end_hour: int = (
-                    solution_at_start_hour.income + contract.price
-            )
-
-            if candidate_best_profits_at_end_hour > solution_at_end_hour.income:
-                """
-                form of pruning:
-                - we only use the current contract if it can improve the current max profits at the contract's end hour
-
-                this update is expensive:
-                - we also use this new solution to update the max profits for all start hours after this contract's end hour
-                and the max profits at the latest contract end time.
-                """
-                new_solution_at_contract_end_hour: Solution = (
-                    solution_at_start_hour.add_contract(contract)
-                )
-                # update the dp table with the better solution
-                dp[curr_contract_end_hour] = new_solution_at_contract_end_hour
-
-                """
-                time Complexity: O(LogN), where N is the number of contracts
-                specifically, worse case happens when all contracts have a unique start time
-
-                use binary search to find the index of the earliest start hour after the end hour, in start_hours
-                """
-                earliest_start_hour_index: int = bisect.bisect_left(
-                    start_hours, curr_contract_end_hour
-                )
-
-                """
-                time Complexity: O(T), where T is the number of unique start times after the current contract end time
-                for all start hours that occur after the contract end hour, update their max profits with the new solution
-                """
-                for start_hour_index in range(
-                        earliest_start_hour_index, len(start_hours)
-                ):
-                    next_start_hour: int = start_hours[start_hour_index]
-                    if next_start_hour <= curr_contract_end_hour:
-                        continue
-
-                    if (
-                            dp.get(start_hours[start_hour_index], Solution.empty()).income
-                            < new_solution_at_contract_end_hour.income
-                    ):
-                        # create a separate new solution
-                        # this prevents the bug where dp dictionary at different start hours
-                        # to point to the same solution, for different
-                        # update the max profit at this start hour
-                        new_solution: Solution = (
-                            new_solution_at_contract_end_hour.copy()
-                        )
-                        dp[start_hours[start_hour_index]] = new_solution
+    the contract which produced the max profit at the latest end hour is the last contract of the path
+    we continue walking from there, through the contract taken right before each contract
+    """
+    path: list[ContractName] = []
+    contract_index: int = int(parent_idx[-1])
+    while contract_index != -1:
+        path.append(ContractName(contracts[pruned_indices[contract_index]].name))
+        contract_index = int(predecessor_idx[contract_index])
+    # the path was walked from the latest contract backwards
+    path.reverse()
 
-        """
-        if no contracts are passed back to us (e.g. end_of_duration = 0, and dp doesn't have end_of_duration)
-        return an empty solution
-        """
-        return dp.get(end_of_duration, Solution.empty())
+    return int(income_dp[-1]), tuple(path)
+
+
+_cached_select_contract_path = lru_cache(maxsize=16)(_select_contract_path)
@@ -0,0 +1,178 @@
+import functools
+import random
+
+import pytest
+
+from models.contract import Contract
+from services.contract_pruning_service import ContractPruningService
+from services.definite_solutions import definite_contract_selector_service
+from services.definite_solutions.definite_contract_selector_service import select_contracts
+
+README_SAMPLE: list[Contract] = [
+    Contract("Contract1", 0, 6, 310),
+    Contract("Contract2", 3, 3, 280),
+    Contract("Contract3", 2, 1, 120),
+    Contract("Contract4", 2, 7, 450),
+    Contract("Contract5", 3, 5, 450),
+    Contract("Contract6", 4, 6, 450),
+]
+
+
+def brute_force_income(contracts: list[Contract]) -> int:
+    """
+    reference max profit; for each contract in (start, duration) order, either skip it, or take it and jump past its end
+    a zero duration contract sorts before the longer contracts at its start, so it can be followed by them
+    """
+    sorted_contracts: list[Contract] = sorted(contracts, key=lambda contract: (contract.start, contract.duration))
+
+    @functools.lru_cache(maxsize=None)
+    def best_from(index: int) -> int:
+        if index >= len(sorted_contracts):
+            return 0
+        contract: Contract = sorted_contracts[index]
+        next_index: int = index + 1
+        while (next_index < len(sorted_contracts)
+               and sorted_contracts[next_index].start < contract.start + contract.duration):
+            next_index += 1
+        return max(best_from(index + 1), contract.price + best_from(next_index))
+
+    return best_from(0)
+
+
+def random_contracts(rng: random.Random, min_duration: int = 1) -> list[Contract]:
+    return [
+        Contract(f"Contract{index}", rng.randint(0, 20), rng.randint(min_duration, 8), rng.randint(1, 50))
+        for index in range(rng.randint(1, 25))
+    ]
+
+
+def test_select_contracts_readme_sample():
+    solution = select_contracts(README_SAMPLE)
+    assert solution.income == 570
+    assert solution.path == ["Contract3", "Contract5"]
+
+
+def test_select_contracts_empty():
+    solution = select_contracts([])
+    assert solution.income == 0
+    assert solution.path == []
+
+
+@pytest.mark.parametrize("min_duration", [1, 0])
+def test_select_contracts_matches_brute_force(min_duration: int):
+    rng = random.Random(0)
+    for _ in range(300):
+        contracts = random_contracts(rng, min_duration)
+        solution = select_contracts(contracts)
+        assert solution.income == brute_force_income(contracts)
+
+        # the path must be a valid schedule which adds up to the income
+        contract_by_name = {contract.name: contract for contract in contracts}
+        path = [contract_by_name[name] for name in solution.path]
+        assert sum(contract.price for contract in path) == solution.income
+        for previous_contract, next_contract in zip(path, path[1:]):
+            assert previous_contract.start + previous_contract.duration <= next_contract.start
+
+
+def test_select_contracts_zero_duration_chains_with_contract_at_same_start():
+    # a zero duration contract does not occupy the spaceship, whatever the longer contract pays
+    for longer_contract_price in [5, 15]:
+        solution = select_contracts([Contract("A", 0, 0, 10), Contract("B", 0, 2, longer_contract_price)])
+        assert solution.income == 10 + longer_contract_price
+        assert solution.path == ["A", "B"]
+
+
+def test_select_contracts_zero_duration_between_contracts():
+    solution = select_contracts([
+        Contract("C8", 1, 3, 27),
+        Contract("C6", 4, 2, 20),
+        Contract("C2", 8, 0, 30),
+        Contract("C0", 8, 4, 10),
+        Contract("Overlapping", 5, 4, 1),
+    ])
+    assert solution.income == 87
+    assert solution.path == ["C8", "C6", "C2", "C0"]
+
+
+def test_select_contracts_zero_duration_inside_a_contract():
+    # the zero duration contract at hour 2 falls inside the contract from hour 0 to 4
+    solution = select_contracts([Contract("Long", 0, 4, 10), Contract("Instant", 2, 0, 3)])
+    assert solution.income == 10
+    assert solution.path == ["Long"]
+
+
+def test_select_contracts_only_zero_durations():
+    solution = select_contracts([Contract("A", 0, 0, 10), Contract("B", 4, 0, 3)])
+    assert solution.income == 13
+    assert solution.path == ["A", "B"]
+
+
+def test_select_contracts_rejects_negative_duration():
+    with pytest.raises(ValueError):
+        select_contracts([Contract("A", 5, -2, 10)])
+
+
+def test_prune_contracts_keeps_only_undominated_contracts():
+    contracts = [
+        Contract("Long", 0, 5, 6),
+        Contract("Short", 0, 3, 5),
+        Contract("SameDurationCheaper", 0, 3, 2),
+        Contract("LongerNotBetter", 0, 4, 5),
+        Contract("OtherStart", 1, 2, 1),
+    ]
+    pruned = ContractPruningService.prune_contracts(contracts)
+    assert [contract.name for contract in pruned] == ["Short", "Long", "OtherStart"]
+
+
+@pytest.mark.parametrize("min_duration", [1, 0])
+def test_prune_contracts_matches_pairwise_dominance(min_duration: int):
+    rng = random.Random(1)
+    for _ in range(300):
+        contracts = random_contracts(rng, min_duration)
+        pruned = ContractPruningService.prune_contracts(contracts)
+
+        # ordered by (start time, duration)
+        assert pruned == sorted(pruned, key=lambda contract: (contract.start, contract.duration))
+        # no kept contract is dominated by another kept contract
+        for candidate in pruned:
+            assert not any(
+                other is not candidate and ContractPruningService.should_prune_contract(candidate, other)
+                for other in pruned
+            )
+        # every dropped contract is dominated by a kept contract
+        for contract in contracts:
+            if contract not in pruned:
+                assert any(ContractPruningService.should_prune_contract(contract, kept) for kept in pruned)
+
+
+def test_prune_contracts_zero_duration():
+    pruned = ContractPruningService.prune_contracts([
+        Contract("A", 0, 0, 10),
+        Contract("AlsoInstant", 0, 0, 4),
+        Contract("B", 0, 2, 5),
+        Contract("C", 0, 3, 5),
+    ])
+    assert [contract.name for contract in pruned] == ["A", "AlsoInstant", "B"]
+
+
+def test_select_contracts_does_not_cache_large_requests():
+    cache_size_before: int = definite_contract_selector_service._cached_select_contract_path.cache_info().currsize
+    contracts = [
+        Contract(f"Contract{index}", index, 1, 1)
+        for index in range(definite_contract_selector_service.MAX_CACHED_CONTRACTS + 1)
+    ]
+    solution = select_contracts(contracts)
+    assert solution.income == len(contracts)
+    assert definite_contract_selector_service._cached_select_contract_path.cache_info().currsize == cache_size_before
+
+
+def test_select_contracts_income_beyond_int64():
+    contracts = [Contract(f"Contract{index}", index, 1, 10 ** 18) for index in range(10)]
+    solution = select_contracts(contracts)
+    assert solution.income == 10 ** 19
+    assert solution.path == [contract.name for contract in contracts]
+
+
+def test_select_contracts_rejects_values_beyond_int64():
+    with pytest.raises(ValueError):
+        select_contracts([Contract("A", 0, 2, 2 ** 64 - 1)])
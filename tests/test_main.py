@@ -0,0 +1,45 @@
+from main import app
+
+
+def test_spaceship_optimize_readme_sample():
+    response = app.test_client().post("/spaceship/optimize", json=[
+        {"name": "Contract1", "start": 0, "duration": 6, "price": 310},
+        {"name": "Contract2", "start": 3, "duration": 3, "price": 280},
+        {"name": "Contract3", "start": 2, "duration": 1, "price": 120},
+        {"name": "Contract4", "start": 2, "duration": 7, "price": 450},
+        {"name": "Contract5", "start": 3, "duration": 5, "price": 450},
+        {"name": "Contract6", "start": 4, "duration": 6, "price": 450},
+    ])
+    assert response.status_code == 200
+    assert response.get_json() == {"income": 570, "path": ["Contract3", "Contract5"]}
+
+
+def test_spaceship_optimize_rejects_malformed_json():
+    response = app.test_client().post(
+        "/spaceship/optimize", data=b"not json", content_type="application/json"
+    )
+    assert response.status_code == 400
+
+
+def test_spaceship_optimize_coerces_contract_fields():
+    response = app.test_client().post("/spaceship/optimize", json=[
+        {"name": 5, "start": "0", "duration": 2, "price": 10},
+    ])
+    assert response.status_code == 200
+    assert response.get_json() == {"income": 10, "path": ["5"]}
+
+
+def test_spaceship_optimize_rejects_invalid_contracts():
+    client = app.test_client()
+    for invalid_contract in [
+        {"name": "Contract1", "start": 0, "duration": 2},
+        {"name": "Contract1", "start": "soon", "duration": 2, "price": 10},
+        {"name": "Contract1", "start": 0, "duration": -2, "price": 10},
+        {"name": None, "start": 0, "duration": 2, "price": 10},
+        {"name": "Contract1", "start": 0, "duration": 2, "price": 18446744073709551615},
+        {"name": "Contract1", "start": 0, "duration": 2, "price": 1e30},
+    ]:
+        response = client.post("/spaceship/optimize", json=[invalid_contract])
+        assert response.status_code == 400
+    for invalid_body in [{}, {"name": "Contract1"}, None, 5]:
+        assert client.post("/spaceship/optimize", json=invalid_body).status_code == 400